@@ -0,0 +1,19 @@
+#!/usr/bin/env bash
+
+set -Eeuo pipefail
+
+# Export Whisper to a fused ONNX graph for the --backend onnx server path.
+# Applies onnxruntime's transformer node fusion and (by default) dynamic
+# int8 quantization. Run this offline; pass the produced .onnx file as
+# --model to transcription_server.py.
+
+MODEL="${MODEL:-openai/whisper-small.en}"
+PRECISION="${PRECISION:-int8}"
+OUTPUT_DIR="${OUTPUT_DIR:-onnx-models}"
+
+python -m onnxruntime.transformers.models.whisper.convert_to_onnx \
+    -m "$MODEL" \
+    --output "$OUTPUT_DIR" \
+    --precision "$PRECISION" \
+    --use_external_data_format \
+    --optimize_onnx
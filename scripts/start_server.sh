@@ -5,6 +5,7 @@ set -Eeuo pipefail
 CONTAINER_NAME=${CONTAINER_NAME:-stt-transcription-server}
 PORT=${PORT:-5000}
 MODEL=${MODEL:-small.en}
+THREADS=${THREADS:-4}
 
 # Clean up any existing container
 docker stop "$CONTAINER_NAME" 2>/dev/null || true
@@ -17,5 +18,8 @@ exec docker run --rm \
     --name "$CONTAINER_NAME" \
     --publish "$PORT:5000" \
     --volume ~/.speech-to-text/whisper:/.whisper \
+    --env STT_MODEL="$MODEL" \
     stt-transcription-server \
-    /home/nonroot/venv/bin/python /app/transcription_server.py --model "$MODEL"
+    /home/nonroot/venv/bin/gunicorn --bind 0.0.0.0:5000 \
+        --workers 1 --threads "$THREADS" --worker-class gthread \
+        --timeout 120 'transcription_server:create_app()'
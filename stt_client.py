@@ -10,21 +10,33 @@ This lightweight script runs on the host and handles:
 Dependencies:
     System: ydotool
     Python: evdev, sounddevice, requests
+    Optional: pyudev (keyboard hotplug support)
 """
 
 import argparse
 import asyncio
+import itertools
 import logging
 import os
 import queue
+import selectors
+import socket
+import struct
 import subprocess
 import sys
-from typing import Any, Callable, List, Optional
+import threading
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
 import evdev
+import numpy as np
 import requests
 import sounddevice
 
+try:
+    import pyudev
+except ImportError:
+    pyudev = None  # type: ignore[assignment]
+
 KeyEventCallback = Callable[[], None]
 
 logger = logging.getLogger(__name__)
@@ -33,14 +45,31 @@ logger = logging.getLogger(__name__)
 class AudioRecorder:
     """Manages audio recording and buffering."""
 
+    BLOCK_SAMPLES = 2048
+    POOL_SIZE = 32
+
     def __init__(self) -> None:
-        self.audio_queue: queue.Queue[bytes] = queue.Queue()
+        self.audio_queue: queue.Queue[Optional[np.ndarray]] = queue.Queue()
         self.recording_active = False
         self.audio_stream: Optional[sounddevice.RawInputStream] = None
+        self._buffer_pool: queue.Queue[np.ndarray] = queue.Queue()
 
     def audio_callback(self, indata: Any, frames: int, time: Any, status: Any) -> None:
-        """Callback for audio stream data."""
-        self.audio_queue.put(bytes(indata))
+        """Callback for audio stream data.
+
+        Runs in PortAudio's realtime thread: copy the CFFI buffer into a
+        pre-allocated int16 block instead of materializing a fresh bytes
+        object on every callback.
+        """
+        block = np.frombuffer(indata, dtype=np.int16)
+        try:
+            buf = self._buffer_pool.get_nowait()
+        except queue.Empty:
+            buf = np.empty(len(block), dtype=np.int16)
+        if len(buf) != len(block):
+            buf = np.empty(len(block), dtype=np.int16)
+        np.copyto(buf, block)
+        self.audio_queue.put(buf)
 
     def start_recording(self) -> None:
         """Start audio recording."""
@@ -50,8 +79,18 @@ class AudioRecorder:
 
         logger.info("Starting audio recording")
         try:
+            # Fresh queue per recording: an upload that failed mid-stream
+            # abandons its consumer with chunks (and the sentinel) still
+            # queued, and those must not leak into the next utterance.
+            self.audio_queue = queue.Queue()
+            # Pre-allocate the recording buffers outside the callback so the
+            # audio thread never has to allocate for typical utterances.
+            self._buffer_pool = queue.Queue(maxsize=self.POOL_SIZE)
+            for _ in range(self.POOL_SIZE):
+                self._buffer_pool.put(np.empty(self.BLOCK_SAMPLES, dtype=np.int16))
+
             self.audio_stream = sounddevice.RawInputStream(
-                samplerate=16000, blocksize=2048, dtype='int16', channels=1,
+                samplerate=16000, blocksize=self.BLOCK_SAMPLES, dtype='int16', channels=1,
                 callback=self.audio_callback
             )
             self.audio_stream.start()
@@ -63,38 +102,85 @@ class AudioRecorder:
             self.recording_active = False
             raise
 
-    def stop_recording(self) -> bytes:
-        """Stop audio recording and return collected audio data."""
+    def _stop_stream(self) -> bool:
+        """Stop and close the active audio stream.
+
+        Returns True if an active stream was stopped.
+        """
         if not self.recording_active:
             logger.debug("Recording not active, nothing to stop")
-            return b""
+            return False
 
         if not self.audio_stream:
             logger.exception("Audio stream is None but recording is active")
             self.recording_active = False
-            return b""
+            return False
 
         try:
             logger.info("Stopping audio recording")
             self.recording_active = False
             self.audio_stream.stop()
             self.audio_stream.close()
-
-            audio_bytes = b""
-            while not self.audio_queue.empty():
-                try:
-                    audio_bytes += self.audio_queue.get_nowait()
-                except queue.Empty:
-                    break
-
-            logger.info(f"Audio recording stopped, collected {len(audio_bytes)} bytes")
-            return audio_bytes
-
+            return True
         except Exception as e:
             logger.exception(f"Error stopping audio recording: {e}")
             self.recording_active = False
+            return False
+
+    def stop_recording(self) -> bytes:
+        """Stop audio recording and return collected audio data."""
+        if not self._stop_stream():
             return b""
 
+        chunks = []
+        while True:
+            try:
+                chunk = self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is not None:
+                chunks.append(chunk)
+        audio_bytes = np.concatenate(chunks).tobytes() if chunks else b""
+
+        logger.info(f"Audio recording stopped, collected {len(audio_bytes)} bytes")
+        return audio_bytes
+
+    def finish_recording(self) -> None:
+        """Stop audio recording and signal the end of the chunk stream."""
+        was_active = self.recording_active
+        self._stop_stream()
+        if was_active:
+            # Sentinel terminating any stream_chunks() consumer.
+            self.audio_queue.put(None)
+
+    def stream_chunks(self) -> Iterator[memoryview]:
+        """Yield recorded audio chunks as they arrive until recording finishes.
+
+        Blocks on the audio queue, so the consumer can start uploading
+        while the recording is still in progress. Chunks are yielded as
+        zero-copy byte views over the pooled int16 buffers; each buffer is
+        recycled into the pool once the consumer has sent it and resumed
+        the generator.
+        """
+        # Bind this recording's queue and pool immediately: the stream
+        # must keep draining the recording it was started for even after
+        # start_recording swaps in fresh ones for the next utterance.
+        audio_queue = self.audio_queue
+        buffer_pool = self._buffer_pool
+
+        def chunks() -> Iterator[memoryview]:
+            while True:
+                chunk = audio_queue.get()
+                if chunk is None:
+                    return
+                yield memoryview(chunk).cast("B")
+                try:
+                    buffer_pool.put_nowait(chunk)
+                except queue.Full:
+                    pass
+
+        return chunks()
+
     def _cleanup_failed_stream(self) -> None:
         """Clean up audio stream after initialization failure."""
         if self.audio_stream:
@@ -125,9 +211,31 @@ class KeyboardMonitor:
     def __init__(self, keyboard_name: Optional[str] = None, key_code: str = 'KEY_RIGHTMETA') -> None:
         self.keyboard_name = keyboard_name
         self.key_code = key_code
+        try:
+            self._key_int = evdev.ecodes.ecodes[key_code]
+        except KeyError:
+            raise ValueError(f"Unknown key code '{key_code}'")
+        self._EV_KEY = evdev.ecodes.EV_KEY
+        self._keyboards: Optional[List[evdev.InputDevice]] = None
+        self._udev_observer: Optional[Any] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+
+    def _is_matching_keyboard(self, device: evdev.InputDevice) -> bool:
+        """Check whether a device is a keyboard matching the configured name."""
+        if "keyboard" not in device.name.lower():
+            return False
+        return self.keyboard_name is None or self.keyboard_name.lower() == device.name.lower()
 
     async def find_keyboards(self) -> List[evdev.InputDevice]:
-        """Find keyboard input devices matching the configured name."""
+        """Find keyboard input devices matching the configured name.
+
+        The device list is enumerated once and cached; hotplugged keyboards
+        are picked up via the udev observer rather than by re-scanning
+        every /dev/input node.
+        """
+        if self._keyboards is not None:
+            return self._keyboards
+
         logger.info("Scanning for keyboard devices")
         keyboards = []
         available_keyboards = []
@@ -137,7 +245,7 @@ class KeyboardMonitor:
                 device = evdev.InputDevice(dev_path)
                 if "keyboard" in device.name.lower():
                     available_keyboards.append(device.name)
-                    if self.keyboard_name is None or self.keyboard_name.lower() == device.name.lower():
+                    if self._is_matching_keyboard(device):
                         logger.info(f"Found matching keyboard: {device.name} ({dev_path})")
                         keyboards.append(device)
             except Exception as e:
@@ -157,26 +265,92 @@ class KeyboardMonitor:
             )
 
         logger.info(f"Found {len(keyboards)} matching keyboard devices")
+        self._keyboards = keyboards
         return keyboards
 
-    async def monitor_device(self, dev_path: str, on_key_press: KeyEventCallback, on_key_release: KeyEventCallback) -> None:
-        """Monitor a single keyboard device for activation key events."""
-        dev = evdev.InputDevice(dev_path)
-        logger.info(f"Waiting for {self.key_code} key press on {dev.name} ({dev_path})")
-
+    def _dispatch_key_event(self, event: Any, on_key_press: KeyEventCallback, on_key_release: KeyEventCallback) -> None:
+        """Dispatch a matched activation-key event to the callbacks.
+
+        Key repeats (value == 2) are ignored.
+        """
+        if event.value == 1:
+            logger.info(f"{self.key_code} pressed")
+            on_key_press()
+        elif event.value == 0:
+            logger.info(f"{self.key_code} released")
+            on_key_release()
+
+    def _poll_loop(self, loop: asyncio.AbstractEventLoop, on_key_press: KeyEventCallback, on_key_release: KeyEventCallback) -> None:
+        """Drain evdev events in a dedicated polling thread.
+
+        Events are read in a tight select/read loop with the activation
+        key filter applied here, so only matched key events cross the
+        thread boundary into the asyncio loop; mice and unrelated keys
+        never touch the scheduler.
+        """
+        assert self._selector is not None
+        ev_key = self._EV_KEY
+        key_int = self._key_int
+
+        while True:
+            for key, _ in self._selector.select():
+                dev = key.data
+                try:
+                    while True:
+                        for event in dev.read():
+                            if event.type == ev_key and event.code == key_int:
+                                loop.call_soon_threadsafe(
+                                    self._dispatch_key_event, event,
+                                    on_key_press, on_key_release
+                                )
+                except BlockingIOError:
+                    pass
+                except OSError as e:
+                    logger.exception(f"Error monitoring device {dev.path}: {e}")
+                    self._selector.unregister(key.fileobj)
+
+            if not self._selector.get_map():
+                logger.error("No keyboard devices left to monitor")
+                return
+
+    def _attach_hotplugged_device(self, dev_path: str) -> None:
+        """Start monitoring a keyboard that appeared after startup."""
         try:
-            async for event in dev.async_read_loop():
-                if event.type == evdev.ecodes.EV_KEY:
-                    key_event = evdev.categorize(event)
-                    if key_event.keycode == self.key_code:
-                        if key_event.keystate == key_event.key_down:
-                            logger.info(f"{self.key_code} pressed")
-                            on_key_press()
-                        elif key_event.keystate == key_event.key_up:
-                            logger.info(f"{self.key_code} released")
-                            on_key_release()
+            device = evdev.InputDevice(dev_path)
         except Exception as e:
-            logger.exception(f"Error monitoring device {dev_path}: {e}")
+            logger.debug(f"Could not access hotplugged device {dev_path}: {e}")
+            return
+
+        if not self._is_matching_keyboard(device):
+            return
+
+        logger.info(f"Hotplugged keyboard: {device.name} ({dev_path})")
+        if self._keyboards is not None:
+            self._keyboards.append(device)
+        if self._selector is not None:
+            # epoll picks up concurrently registered fds, so the polling
+            # thread sees the new keyboard without an explicit wakeup.
+            self._selector.register(device.fileno(), selectors.EVENT_READ, device)
+
+    def _start_hotplug_observer(self) -> None:
+        """Subscribe to udev input events instead of re-polling /dev/input."""
+        if pyudev is None:
+            logger.debug("pyudev not available, keyboard hotplug disabled")
+            return
+
+        def on_udev_event(device: Any) -> None:
+            if device.action != 'add' or device.device_node is None:
+                return
+            if not device.device_node.startswith('/dev/input/event'):
+                return
+            self._attach_hotplugged_device(device.device_node)
+
+        context = pyudev.Context()
+        monitor = pyudev.Monitor.from_netlink(context)
+        monitor.filter_by('input')
+        self._udev_observer = pyudev.MonitorObserver(monitor, callback=on_udev_event)
+        self._udev_observer.start()
+        logger.info("Started udev keyboard hotplug observer")
 
     async def start_monitoring(self, on_key_press: KeyEventCallback, on_key_release: KeyEventCallback) -> None:
         """Start monitoring all matching keyboards."""
@@ -184,10 +358,25 @@ class KeyboardMonitor:
         if not keyboards:
             raise RuntimeError("No keyboard input devices found.")
 
-        await asyncio.gather(*(
-            self.monitor_device(str(dev.path), on_key_press, on_key_release)
-            for dev in keyboards
-        ))
+        self._selector = selectors.DefaultSelector()
+        for dev in keyboards:
+            logger.info(f"Waiting for {self.key_code} key press on {dev.name} ({dev.path})")
+            self._selector.register(dev.fileno(), selectors.EVENT_READ, dev)
+
+        self._start_hotplug_observer()
+
+        loop = asyncio.get_running_loop()
+        poll_thread = threading.Thread(
+            target=self._poll_loop,
+            args=(loop, on_key_press, on_key_release),
+            daemon=True,
+        )
+        poll_thread.start()
+
+        # The polling thread owns the device fds; keep this coroutine
+        # alive (and the event loop serving dispatched callbacks) until
+        # the thread exits because no devices remain.
+        await loop.run_in_executor(None, poll_thread.join)
 
 
 class TranscriptionClient:
@@ -197,6 +386,32 @@ class TranscriptionClient:
         self.api_url = api_url.rstrip('/')
         self.language = language
         self.pad_seconds = pad_seconds
+        # Keep-alive session so each utterance reuses the pooled TCP
+        # connection instead of paying a fresh handshake per request.
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post_audio(self, data: Any) -> str:
+        """POST audio data (bytes or a chunk iterator) and return text."""
+        params = {"language": self.language}
+        if self.pad_seconds > 0:
+            params["pad_seconds"] = str(self.pad_seconds)
+
+        response = self.session.post(
+            f"{self.api_url}/transcribe",
+            data=data,
+            params=params,
+            headers={"Content-Type": "audio/l16; rate=16000"},
+            timeout=60
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        text = result.get("text", "").strip()
+        logger.info(f"Transcription result: '{text}'")
+        return text
 
     def transcribe(self, audio_data: bytes) -> str:
         """Send audio to transcription API and return text."""
@@ -207,90 +422,95 @@ class TranscriptionClient:
         logger.info(f"Sending {len(audio_data)} bytes to transcription API")
 
         try:
-            params = {"language": self.language}
-            if self.pad_seconds > 0:
-                params["pad_seconds"] = str(self.pad_seconds)
-
-            response = requests.post(
-                f"{self.api_url}/transcribe",
-                data=audio_data,
-                params=params,
-                headers={"Content-Type": "application/octet-stream"},
-                timeout=60
-            )
-            response.raise_for_status()
+            return self._post_audio(audio_data)
+        except requests.exceptions.RequestException as e:
+            logger.exception(f"Transcription API error: {e}")
+            return ""
+
+    def transcribe_stream(self, audio_chunks: Iterator[Any]) -> str:
+        """Stream audio chunks to the transcription API and return text.
+
+        The chunks are sent with chunked transfer encoding as they are
+        produced, so the server can start processing while the recording
+        is still in progress.
+        """
+        # Wait for the first chunk before opening the request: a key tap
+        # shorter than one block captures no audio at all, and an empty
+        # POST would only earn a 400 from the server.
+        audio_chunks = iter(audio_chunks)
+        try:
+            first_chunk = next(audio_chunks)
+        except StopIteration:
+            logger.info("No audio data captured")
+            return ""
 
-            result = response.json()
-            text = result.get("text", "").strip()
-            logger.info(f"Transcription result: '{text}'")
-            return text
+        logger.info("Streaming audio to transcription API")
 
+        try:
+            return self._post_audio(itertools.chain((first_chunk,), audio_chunks))
         except requests.exceptions.RequestException as e:
             logger.exception(f"Transcription API error: {e}")
             return ""
 
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self.session.close()
+
 
 # Keyboard layout mappings: character -> (keycode, needs_shift)
 # Keycodes from linux/input-event-codes.h
-LAYOUT_US = {
-    'a': (30, False), 'b': (48, False), 'c': (46, False), 'd': (32, False),
-    'e': (18, False), 'f': (33, False), 'g': (34, False), 'h': (35, False),
-    'i': (23, False), 'j': (36, False), 'k': (37, False), 'l': (38, False),
-    'm': (50, False), 'n': (49, False), 'o': (24, False), 'p': (25, False),
-    'q': (16, False), 'r': (19, False), 's': (31, False), 't': (20, False),
-    'u': (22, False), 'v': (47, False), 'w': (17, False), 'x': (45, False),
-    'y': (21, False), 'z': (44, False),
-    'A': (30, True), 'B': (48, True), 'C': (46, True), 'D': (32, True),
-    'E': (18, True), 'F': (33, True), 'G': (34, True), 'H': (35, True),
-    'I': (23, True), 'J': (36, True), 'K': (37, True), 'L': (38, True),
-    'M': (50, True), 'N': (49, True), 'O': (24, True), 'P': (25, True),
-    'Q': (16, True), 'R': (19, True), 'S': (31, True), 'T': (20, True),
-    'U': (22, True), 'V': (47, True), 'W': (17, True), 'X': (45, True),
-    'Y': (21, True), 'Z': (44, True),
-    '1': (2, False), '2': (3, False), '3': (4, False), '4': (5, False),
-    '5': (6, False), '6': (7, False), '7': (8, False), '8': (9, False),
-    '9': (10, False), '0': (11, False),
-    '!': (2, True), '@': (3, True), '#': (4, True), '$': (5, True),
-    '%': (6, True), '^': (7, True), '&': (8, True), '*': (9, True),
-    '(': (10, True), ')': (11, True),
-    ' ': (57, False), '\n': (28, False), '\t': (15, False),
-    '-': (12, False), '=': (13, False), '[': (26, False), ']': (27, False),
-    '\\': (43, False), ';': (39, False), "'": (40, False), '`': (41, False),
-    ',': (51, False), '.': (52, False), '/': (53, False),
-    '_': (12, True), '+': (13, True), '{': (26, True), '}': (27, True),
-    '|': (43, True), ':': (39, True), '"': (40, True), '~': (41, True),
-    '<': (51, True), '>': (52, True), '?': (53, True),
-}
 
-LAYOUT_DE = {
-    'a': (30, False), 'b': (48, False), 'c': (46, False), 'd': (32, False),
-    'e': (18, False), 'f': (33, False), 'g': (34, False), 'h': (35, False),
-    'i': (23, False), 'j': (36, False), 'k': (37, False), 'l': (38, False),
-    'm': (50, False), 'n': (49, False), 'o': (24, False), 'p': (25, False),
-    'q': (16, False), 'r': (19, False), 's': (31, False), 't': (20, False),
-    'u': (22, False), 'v': (47, False), 'w': (17, False), 'x': (45, False),
-    'y': (44, False), 'z': (21, False),  # Y and Z swapped
-    'A': (30, True), 'B': (48, True), 'C': (46, True), 'D': (32, True),
-    'E': (18, True), 'F': (33, True), 'G': (34, True), 'H': (35, True),
-    'I': (23, True), 'J': (36, True), 'K': (37, True), 'L': (38, True),
-    'M': (50, True), 'N': (49, True), 'O': (24, True), 'P': (25, True),
-    'Q': (16, True), 'R': (19, True), 'S': (31, True), 'T': (20, True),
-    'U': (22, True), 'V': (47, True), 'W': (17, True), 'X': (45, True),
-    'Y': (44, True), 'Z': (21, True),  # Y and Z swapped
-    '1': (2, False), '2': (3, False), '3': (4, False), '4': (5, False),
-    '5': (6, False), '6': (7, False), '7': (8, False), '8': (9, False),
-    '9': (10, False), '0': (11, False),
-    '!': (2, True), '"': (3, True), '§': (4, True), '$': (5, True),
-    '%': (6, True), '&': (7, True), '/': (8, True), '(': (9, True),
-    ')': (10, True), '=': (11, True),
-    ' ': (57, False), '\n': (28, False), '\t': (15, False),
-    'ß': (12, False), '´': (13, False), 'ü': (26, False), '+': (27, False),
-    '#': (43, False), 'ö': (39, False), 'ä': (40, False), '^': (41, False),
-    ',': (51, False), '.': (52, False), '-': (53, False),
-    '?': (12, True), '`': (13, True), 'Ü': (26, True), '*': (27, True),
-    "'": (43, True), 'Ö': (39, True), 'Ä': (40, True), '°': (41, True),
-    ';': (51, True), ':': (52, True), '_': (53, True),
-}
+# Keycodes of the punctuation positions after the digit row:
+# MINUS, EQUAL, LEFTBRACE, RIGHTBRACE, BACKSLASH, SEMICOLON, APOSTROPHE,
+# GRAVE, COMMA, DOT, SLASH
+_PUNCT_KEYCODES = (12, 13, 26, 27, 43, 39, 40, 41, 51, 52, 53)
+
+
+def _build_layout(
+    letter_rows: List[Tuple[int, str]],
+    digit_symbols: str,
+    punct: str,
+    punct_shifted: str,
+) -> dict:
+    """Build a char -> (keycode, needs_shift) table from compact row specs.
+
+    letter_rows holds (base_keycode, letters) pairs; uppercase variants
+    are generated with the shift flag set. digit_symbols are the shifted
+    characters on the 1..0 row; punct and punct_shifted are the unshifted
+    and shifted characters at _PUNCT_KEYCODES.
+    """
+    layout = {}
+    for base, letters in letter_rows:
+        for offset, char in enumerate(letters):
+            layout[char] = (base + offset, False)
+            layout[char.upper()] = (base + offset, True)
+    for offset, char in enumerate("1234567890"):
+        layout[char] = (2 + offset, False)
+    for offset, char in enumerate(digit_symbols):
+        layout[char] = (2 + offset, True)
+    layout[' '] = (57, False)
+    layout['\n'] = (28, False)
+    layout['\t'] = (15, False)
+    for keycode, char in zip(_PUNCT_KEYCODES, punct):
+        layout[char] = (keycode, False)
+    for keycode, char in zip(_PUNCT_KEYCODES, punct_shifted):
+        layout[char] = (keycode, True)
+    return layout
+
+
+LAYOUT_US = _build_layout(
+    letter_rows=[(16, "qwertyuiop"), (30, "asdfghjkl"), (44, "zxcvbnm")],
+    digit_symbols="!@#$%^&*()",
+    punct="-=[]\\;'`,./",
+    punct_shifted='_+{}|:"~<>?',
+)
+
+LAYOUT_DE = _build_layout(
+    letter_rows=[(16, "qwertzuiop"), (30, "asdfghjkl"), (44, "yxcvbnm")],  # Y and Z swapped
+    digit_symbols='!"§$%&/()=',
+    punct="ß´ü+#öä^,.-",
+    punct_shifted="?`Ü*'ÖÄ°;:_",
+)
 
 KEYBOARD_LAYOUTS = {
     'us': LAYOUT_US,
@@ -298,36 +518,89 @@ KEYBOARD_LAYOUTS = {
 }
 
 
+# Both the ydotool CLI and our direct socket writes honour YDOTOOL_SOCKET
+# from the process environment; set it once instead of copying the whole
+# environment per YdotoolOutput instance and per subprocess launch.
+os.environ.setdefault("YDOTOOL_SOCKET", "/tmp/.ydotool_socket")
+
+
 class YdotoolOutput:
-    """Output handler using ydotool for text injection with keyboard layout support."""
+    """Output handler using ydotool for text injection with keyboard layout support.
+
+    Key events are written directly to the ydotoold Unix socket when it is
+    available, avoiding a fork+exec of the ydotool CLI per utterance; the
+    CLI is kept as a fallback when no daemon socket exists.
+    """
 
     KEY_LEFTSHIFT = 42
 
+    # struct input_event: struct timeval (2 longs), __u16 type, __u16 code,
+    # __s32 value. ydotoold ignores the timestamps.
+    _INPUT_EVENT = struct.Struct("llHHi")
+    _EV_SYN = 0
+    _EV_KEY = 1
+    _SYN_REPORT = 0
+
     def __init__(self, layout: str = 'us', delay_ms: int = 0) -> None:
         self.delay_ms = delay_ms
-        self.env = os.environ.copy()
-        self.env["YDOTOOL_SOCKET"] = "/tmp/.ydotool_socket"
+        self.socket_path = os.environ["YDOTOOL_SOCKET"]
         if layout not in KEYBOARD_LAYOUTS:
             available = ', '.join(KEYBOARD_LAYOUTS.keys())
             raise ValueError(f"Unknown keyboard layout '{layout}'. Available: {available}")
         self.layout = KEYBOARD_LAYOUTS[layout]
         self.layout_name = layout
-
-    def _char_to_keys(self, char: str) -> Optional[List[str]]:
-        """Convert a character to ydotool key sequence."""
-        if char not in self.layout:
-            logger.warning(f"Character '{char}' not in {self.layout_name} layout, skipping")
-            return None
-
-        keycode, needs_shift = self.layout[char]
-        if needs_shift:
-            return [
-                f"{self.KEY_LEFTSHIFT}:1",
-                f"{keycode}:1", f"{keycode}:0",
-                f"{self.KEY_LEFTSHIFT}:0"
-            ]
-        else:
-            return [f"{keycode}:1", f"{keycode}:0"]
+        self._sock: Optional[socket.socket] = None
+        # Translate each layout character to a compact one-byte index, and
+        # precompute everything addressed by that index: the shift flag,
+        # the packed press/release wire segment for the socket path, and
+        # the CLI token pair. send_text can then map a whole string with
+        # str.translate and join precomputed segments at C speed. The
+        # layouts stay well under 256 entries, so the index fits latin-1.
+        chars = list(self.layout)
+        self._trans = str.maketrans({char: chr(i) for i, char in enumerate(chars)})
+        self._idx_shift = bytes(self.layout[char][1] for char in chars)
+        self._idx_packed = [
+            self._pack_key_event(self.layout[char][0], 1)
+            + self._pack_key_event(self.layout[char][0], 0)
+            for char in chars
+        ]
+        self._idx_tokens = [
+            (f"{self.layout[char][0]}:1", f"{self.layout[char][0]}:0")
+            for char in chars
+        ]
+        self._shift_press_packed = self._pack_key_event(self.KEY_LEFTSHIFT, 1)
+        self._shift_release_packed = self._pack_key_event(self.KEY_LEFTSHIFT, 0)
+        self._shift_press_token = f"{self.KEY_LEFTSHIFT}:1"
+        self._shift_release_token = f"{self.KEY_LEFTSHIFT}:0"
+
+    def _pack_key_event(self, keycode: int, value: int) -> bytes:
+        """Pack one key event plus its SYN_REPORT in ydotoold wire format."""
+        return (
+            self._INPUT_EVENT.pack(0, 0, self._EV_KEY, keycode, value)
+            + self._INPUT_EVENT.pack(0, 0, self._EV_SYN, self._SYN_REPORT, 0)
+        )
+
+    def _connect_socket(self) -> Optional[socket.socket]:
+        """Connect to the ydotoold socket, reusing an open connection."""
+        if self._sock is None:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(self.socket_path)
+                self._sock = sock
+                logger.info(f"Connected to ydotoold socket at {self.socket_path}")
+            except OSError as e:
+                logger.debug(f"ydotoold socket unavailable ({e}), using ydotool CLI")
+        return self._sock
+
+    def close(self) -> None:
+        """Close the ydotoold socket connection if open."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError as e:
+                logger.debug(f"Error closing ydotoold socket: {e}")
+            finally:
+                self._sock = None
 
     def send_text(self, text: str) -> None:
         """Send text via ydotool with layout-aware key mapping."""
@@ -338,19 +611,71 @@ class YdotoolOutput:
         text = text + " "
         logger.info(f"Injecting text via ydotool ({self.layout_name} layout): '{text}'")
 
-        key_sequence: List[str] = []
-        for char in text:
-            keys = self._char_to_keys(char)
-            if keys:
-                key_sequence.extend(keys)
+        missing = set(text) - self.layout.keys()
+        if missing:
+            for char in missing:
+                logger.warning(f"Character '{char}' not in {self.layout_name} layout, skipping")
+            text = text.translate({ord(char): None for char in missing})
 
-        if not key_sequence:
+        # Bulk-map the whole string to compact key indices in C; the
+        # remaining Python work is per shift-run, not per character.
+        indices = text.translate(self._trans).encode('latin-1')
+
+        if not indices:
             logger.warning("No valid characters to type")
             return
 
+        self._send_key_runs(indices)
+
+    def _send_key_runs(self, indices: bytes) -> None:
+        """Inject translated key indices via the ydotoold socket, or the CLI.
+
+        Indices are grouped into contiguous same-shift runs so shift is
+        held across each run, and each run is flattened by joining
+        precomputed per-index segments.
+        """
+        runs = [
+            (needs_shift, bytes(run))
+            for needs_shift, run in itertools.groupby(indices, key=self._idx_shift.__getitem__)
+        ]
+
+        if self._connect_socket() is not None:
+            parts: List[bytes] = []
+            for needs_shift, run in runs:
+                if needs_shift:
+                    parts.append(self._shift_press_packed)
+                parts.extend(map(self._idx_packed.__getitem__, run))
+                if needs_shift:
+                    parts.append(self._shift_release_packed)
+            payload = b"".join(parts)
+            # Retry once through a fresh connection: the held socket may
+            # have gone stale if ydotoold restarted between utterances.
+            for attempt in range(2):
+                sock = self._connect_socket()
+                if sock is None:
+                    break
+                try:
+                    sock.sendall(payload)
+                    logger.info("Text injection successful")
+                    return
+                except OSError as e:
+                    logger.warning(f"ydotoold socket write failed ({e}), reconnecting")
+                    self.close()
+            logger.warning("ydotoold socket unusable, falling back to ydotool CLI")
+
+        key_sequence: List[str] = []
+        for needs_shift, run in runs:
+            if needs_shift:
+                key_sequence.append(self._shift_press_token)
+            key_sequence.extend(itertools.chain.from_iterable(
+                map(self._idx_tokens.__getitem__, run)
+            ))
+            if needs_shift:
+                key_sequence.append(self._shift_release_token)
+
         try:
             cmd = ["ydotool", "key"] + key_sequence
-            result = subprocess.run(cmd, capture_output=True, text=True, env=self.env)
+            result = subprocess.run(cmd, capture_output=True, text=True)
             if result.returncode != 0:
                 logger.error(f"ydotool failed with code {result.returncode}: {result.stderr}")
             else:
@@ -376,36 +701,66 @@ class SpeechToTextClient:
         self.keyboard_monitor = keyboard_monitor
         self.transcription_client = transcription_client
         self.output_handler = output_handler
+        # Transcriptions are injected from a dedicated writer thread so
+        # text injection never stalls the keyboard monitor loop or the
+        # per-utterance streaming threads, and overlapping utterances are
+        # typed strictly in completion order.
+        self._text_queue: queue.Queue[Optional[str]] = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
 
     def on_key_press(self) -> None:
         """Handle activation key press."""
+        if self.audio_recorder.recording_active:
+            logger.debug("Recording already active, ignoring key press")
+            return
+
         logger.info("Key press detected, starting audio recording")
         self.audio_recorder.start_recording()
+        # Upload audio while the user is still speaking so the server can
+        # start processing before the key is released.
+        threading.Thread(target=self._stream_transcription, daemon=True).start()
+
+    def _stream_transcription(self) -> None:
+        """Stream the current recording to the API and queue the result."""
+        text = self.transcription_client.transcribe_stream(
+            self.audio_recorder.stream_chunks()
+        )
+        if text:
+            self._text_queue.put(text)
+        else:
+            logger.info("Transcription returned empty text")
+
+    def _writer_loop(self) -> None:
+        """Inject queued transcriptions until the shutdown sentinel arrives."""
+        while True:
+            text = self._text_queue.get()
+            if text is None:
+                return
+            self.output_handler.send_text(text)
 
     def on_key_release(self) -> None:
         """Handle activation key release."""
-        logger.info("Key release detected, processing audio")
-        audio_data = self.audio_recorder.stop_recording()
-        if audio_data:
-            text = self.transcription_client.transcribe(audio_data)
-            if text:
-                self.output_handler.send_text(text)
-            else:
-                logger.info("Transcription returned empty text")
-        else:
-            logger.info("No audio data captured")
+        logger.info("Key release detected, finishing audio stream")
+        self.audio_recorder.finish_recording()
 
     def start(self) -> None:
         """Start the speech-to-text client."""
         logger.info("Starting speech-to-text client")
 
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
         try:
             asyncio.run(self.keyboard_monitor.start_monitoring(
                 self.on_key_press,
                 self.on_key_release
             ))
         finally:
+            self._text_queue.put(None)
+            self._writer_thread.join(timeout=5)
             self.audio_recorder.cleanup()
+            self.transcription_client.close()
+            self.output_handler.close()
 
 
 def main() -> None:
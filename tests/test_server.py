@@ -0,0 +1,136 @@
+import io
+import json
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import transcription_server
+from transcription_server import MAX_AUDIO_BYTES, SAMPLE_RATE
+
+
+class FakeWhisperModel:
+    """Stand-in for the loaded model that records each transcribe call."""
+
+    device = "cpu"
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, fp16=False, language=None):
+        self.calls.append((len(audio), language))
+        return {"text": "hello there", "segments": [{"text": " hello"}, {"text": " there"}]}
+
+
+class TestTranscribeEndpoint:
+    """Test /transcribe handler behavior against a fake model."""
+
+    def setup_method(self):
+        """Install the fake model and remember the real module state."""
+        self._saved = (
+            transcription_server.model,
+            transcription_server.backend,
+            transcription_server.model_name,
+            transcription_server.force_english,
+        )
+        self.model = FakeWhisperModel()
+        transcription_server.model = self.model
+        transcription_server.backend = "whisper"
+        transcription_server.model_name = "small.en"
+        transcription_server.force_english = False
+        self.client = transcription_server.app.test_client()
+
+    def teardown_method(self):
+        """Restore the module state."""
+        (
+            transcription_server.model,
+            transcription_server.backend,
+            transcription_server.model_name,
+            transcription_server.force_english,
+        ) = self._saved
+
+    def post_pcm(self, data, path="/transcribe", content_type="application/octet-stream"):
+        """POST raw PCM bytes (or a stream) to the transcribe endpoint."""
+        return self.client.post(path, data=data, content_type=content_type)
+
+    def loud_pcm(self, n_samples=1600):
+        """Raw PCM well above the silence threshold."""
+        return np.full(n_samples, 1000, dtype=np.int16).tobytes()
+
+    def test_l16_rate_mismatch_rejected(self):
+        """Test that audio/l16 with a non-16k rate is a 400."""
+        response = self.post_pcm(self.loud_pcm(), content_type="audio/l16; rate=8000")
+        assert response.status_code == 400
+        assert self.model.calls == []
+
+    def test_l16_at_sample_rate_accepted(self):
+        """Test that audio/l16 at 16kHz transcribes normally."""
+        response = self.post_pcm(self.loud_pcm(), content_type="audio/l16; rate=16000")
+        assert response.status_code == 200
+        assert response.get_json()["text"] == "hello there"
+
+    def test_empty_body_rejected(self):
+        """Test that an empty body is a 400."""
+        response = self.post_pcm(b"")
+        assert response.status_code == 400
+
+    def test_oversize_body_rejected(self):
+        """Test that a body over the PCM cap is a 413."""
+        response = self.post_pcm(io.BytesIO(bytes(MAX_AUDIO_BYTES + 2)))
+        assert response.status_code == 413
+        assert self.model.calls == []
+
+    def test_silent_clip_short_circuits(self):
+        """Test that a silent clip returns empty text without inference."""
+        response = self.post_pcm(np.zeros(1600, dtype=np.int16).tobytes())
+        assert response.status_code == 200
+        assert response.get_json() == {"text": ""}
+        assert self.model.calls == []
+
+    def test_clip_above_silence_threshold_transcribes(self):
+        """Test that audio above the silence peak reaches the model."""
+        response = self.post_pcm(self.loud_pcm())
+        assert response.status_code == 200
+        assert len(self.model.calls) == 1
+
+    def test_silent_clip_streams_ndjson(self):
+        """Test that a silent clip keeps NDJSON framing under stream=1."""
+        response = self.post_pcm(
+            np.zeros(1600, dtype=np.int16).tobytes(), path="/transcribe?stream=1"
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert response.get_data() == b""
+
+    def test_pad_seconds_pads_during_conversion(self):
+        """Test that pad_seconds extends the audio handed to the model."""
+        self.post_pcm(self.loud_pcm(1600), path="/transcribe?pad_seconds=1")
+        assert self.model.calls == [(SAMPLE_RATE, "en")]
+
+    def test_stream_returns_ndjson_segments(self):
+        """Test that stream=1 yields one NDJSON line per segment."""
+        response = self.post_pcm(self.loud_pcm(), path="/transcribe?stream=1")
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"segment": 0, "text": "hello"},
+            {"segment": 1, "text": "there"},
+        ]
+
+    def test_en_model_skips_language_detection(self):
+        """Test that auto language resolves to en on a .en model."""
+        self.post_pcm(self.loud_pcm())
+        assert self.model.calls[-1][1] == "en"
+
+    def test_multilingual_model_keeps_auto_detection(self):
+        """Test that auto language stays None on a multilingual model."""
+        transcription_server.model_name = "small"
+        self.post_pcm(self.loud_pcm())
+        assert self.model.calls[-1][1] is None
+
+    def test_force_english_overrides_request_language(self):
+        """Test that --force-english wins over the language parameter."""
+        transcription_server.force_english = True
+        self.post_pcm(self.loud_pcm(), path="/transcribe?language=de")
+        assert self.model.calls[-1][1] == "en"
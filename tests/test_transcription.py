@@ -1,9 +1,35 @@
+import queue
 import sys
 import os
 from unittest.mock import patch, Mock
 
+import numpy as np
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from stt_client import AudioRecorder, SpeechToTextClient, TranscriptionClient, YdotoolOutput
+from stt_client import (
+    LAYOUT_DE,
+    LAYOUT_US,
+    AudioRecorder,
+    SpeechToTextClient,
+    TranscriptionClient,
+    YdotoolOutput,
+)
+
+
+class TestKeyboardLayouts:
+    """Test the generated keyboard layout tables."""
+
+    def test_uppercase_shares_keycode_with_shift(self):
+        """Test that uppercase letters map to the lowercase keycode plus shift."""
+        for char in "az":
+            keycode, needs_shift = LAYOUT_US[char]
+            assert not needs_shift
+            assert LAYOUT_US[char.upper()] == (keycode, True)
+
+    def test_de_layout_swaps_y_and_z(self):
+        """Test the QWERTZ y/z swap relative to the US layout."""
+        assert LAYOUT_DE['y'] == LAYOUT_US['z']
+        assert LAYOUT_DE['z'] == LAYOUT_US['y']
 
 
 class TestAudioRecording:
@@ -15,13 +41,27 @@ class TestAudioRecording:
 
     def test_audio_callback(self):
         """Test audio callback with real queue."""
-        test_data = b"audio_test_data"
+        test_data = b"\x01\x00\x02\x00\x03\x00\x04\x00"  # Four 16-bit samples
 
-        self.recorder.audio_callback(test_data, 1024, None, None)
+        self.recorder.audio_callback(test_data, 4, None, None)
 
         assert not self.recorder.audio_queue.empty()
         retrieved_data = self.recorder.audio_queue.get()
-        assert retrieved_data == test_data
+        assert retrieved_data.tobytes() == test_data
+
+    def test_stream_chunks_bound_to_current_recording(self):
+        """Test that a stream keeps draining the queue it started with."""
+        first_queue = self.recorder.audio_queue
+        stream = self.recorder.stream_chunks()
+
+        # A new recording swaps in a fresh queue; the old stream must not
+        # consume from it, and leftovers must not leak forward.
+        self.recorder.audio_queue = queue.Queue()
+        first_queue.put(np.array([1, 2], dtype=np.int16))
+        first_queue.put(None)
+
+        assert len(list(stream)) == 1
+        assert self.recorder.audio_queue.empty()
 
     def test_stop_recording_no_stream(self):
         """Test stopping recording when no stream exists."""
@@ -38,16 +78,24 @@ class TestTranscriptionClient:
         result = client.transcribe(b"")
         assert result == ""
 
-    @patch('stt_client.requests.post')
-    def test_transcribe_success(self, mock_post):
+    def test_transcribe_stream_empty_recording(self):
+        """Test that a recording with no audio skips the HTTP request."""
+        client = TranscriptionClient("http://localhost:5000")
+        with patch.object(client.session, 'post') as mock_post:
+            result = client.transcribe_stream(iter([]))
+
+        assert result == ""
+        mock_post.assert_not_called()
+
+    def test_transcribe_success(self):
         """Test successful transcription."""
         mock_response = Mock()
         mock_response.json.return_value = {"text": "hello world"}
         mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
 
         client = TranscriptionClient("http://localhost:5000", language="en")
-        result = client.transcribe(b"audio_data")
+        with patch.object(client.session, 'post', return_value=mock_response) as mock_post:
+            result = client.transcribe(b"audio_data")
 
         assert result == "hello world"
         mock_post.assert_called_once()
@@ -73,15 +121,44 @@ class TestYdotoolOutput:
         mock_run.assert_called_once()
         call_args = mock_run.call_args[0][0]
         assert "ydotool" in call_args
-        assert "hello world" in call_args
+        # 'h' is keycode 35 in the US layout
+        assert "35:1" in call_args
+        assert "35:0" in call_args
+
+    @patch('stt_client.subprocess.run')
+    def test_send_text_holds_shift_across_runs(self, mock_run):
+        """Test that shift is pressed once around a run of shifted chars."""
+        mock_run.return_value = Mock(returncode=0)
+
+        output = YdotoolOutput()
+        output.send_text("HI")
+
+        call_args = mock_run.call_args[0][0]
+        assert call_args.count("42:1") == 1
+        assert call_args.count("42:0") == 1
+
+    @patch('stt_client.subprocess.run')
+    def test_send_text_uses_daemon_socket_when_connected(self, mock_run):
+        """Test that an open ydotoold socket is used instead of the CLI."""
+        output = YdotoolOutput()
+        output._sock = Mock()
+
+        output.send_text("hi")
+
+        output._sock.sendall.assert_called_once()
+        payload = output._sock.sendall.call_args[0][0]
+        # One input_event pair (key + SYN_REPORT) per press/release
+        assert len(payload) % (2 * YdotoolOutput._INPUT_EVENT.size) == 0
+        mock_run.assert_not_called()
 
 
 class TestSpeechToTextClient:
     """Test overall client workflow."""
 
-    def test_key_press_starts_recording(self):
-        """Test that key press starts recording."""
+    def make_client(self):
+        """Build a client wired with mock components."""
         audio_recorder = Mock()
+        audio_recorder.recording_active = False
         keyboard_monitor = Mock()
         transcription_client = Mock()
         output_handler = Mock()
@@ -90,27 +167,49 @@ class TestSpeechToTextClient:
             audio_recorder, keyboard_monitor,
             transcription_client, output_handler
         )
+        return client, audio_recorder, transcription_client, output_handler
+
+    def test_key_press_starts_recording(self):
+        """Test that key press starts recording."""
+        client, audio_recorder, _, _ = self.make_client()
 
         client.on_key_press()
         audio_recorder.start_recording.assert_called_once()
 
-    def test_key_release_processes_audio(self):
-        """Test that key release processes audio data."""
-        audio_recorder = Mock()
-        keyboard_monitor = Mock()
-        transcription_client = Mock()
-        output_handler = Mock()
+    def test_key_press_ignored_while_recording(self):
+        """Test that a repeated key press does not restart recording."""
+        client, audio_recorder, _, _ = self.make_client()
+        audio_recorder.recording_active = True
 
-        audio_recorder.stop_recording.return_value = b"audio_data"
-        transcription_client.transcribe.return_value = "transcribed text"
+        client.on_key_press()
+        audio_recorder.start_recording.assert_not_called()
 
-        client = SpeechToTextClient(
-            audio_recorder, keyboard_monitor,
-            transcription_client, output_handler
-        )
+    def test_key_release_finishes_stream(self):
+        """Test that key release terminates the audio stream."""
+        client, audio_recorder, _, _ = self.make_client()
 
         client.on_key_release()
+        audio_recorder.finish_recording.assert_called_once()
+
+    def test_stream_transcription_queues_text(self):
+        """Test that streamed audio is transcribed and queued for injection."""
+        client, audio_recorder, transcription_client, _ = self.make_client()
+
+        chunk_stream = iter([b"audio_data"])
+        audio_recorder.stream_chunks.return_value = chunk_stream
+        transcription_client.transcribe_stream.return_value = "transcribed text"
+
+        client._stream_transcription()
+
+        transcription_client.transcribe_stream.assert_called_once_with(chunk_stream)
+        assert client._text_queue.get_nowait() == "transcribed text"
+
+    def test_writer_loop_injects_queued_text(self):
+        """Test that the writer loop sends queued text until the sentinel."""
+        client, _, _, output_handler = self.make_client()
+
+        client._text_queue.put("transcribed text")
+        client._text_queue.put(None)
+        client._writer_loop()
 
-        audio_recorder.stop_recording.assert_called_once()
-        transcription_client.transcribe.assert_called_once_with(b"audio_data")
         output_handler.send_text.assert_called_once_with("transcribed text")
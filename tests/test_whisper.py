@@ -39,16 +39,19 @@ class TestTranscriptionServer:
                     import numpy as np
                     from numpy.typing import NDArray
 
+                    # Keep samples at int16 scale throughout instead of
+                    # normalizing to [-1, 1] and scaling back afterwards,
+                    # which costs two extra full-buffer passes.
                     audio_np: NDArray[np.float32]
                     if sample_width == 1:
                         raw_audio = np.frombuffer(audio_data, dtype=np.uint8)
-                        audio_np = (raw_audio.astype(np.float32) - 128) / 128.0
+                        audio_np = (raw_audio.astype(np.float32) - 128) * 256.0
                     elif sample_width == 2:
                         raw_audio = np.frombuffer(audio_data, dtype=np.int16)
-                        audio_np = raw_audio.astype(np.float32) / 32768.0
+                        audio_np = raw_audio.astype(np.float32)
                     elif sample_width == 4:
                         raw_audio = np.frombuffer(audio_data, dtype=np.int32)
-                        audio_np = raw_audio.astype(np.float32) / 2147483648.0
+                        audio_np = raw_audio.astype(np.float32) / 65536.0
                     else:
                         return audio_data
 
@@ -56,11 +59,15 @@ class TestTranscriptionServer:
                         audio_np = audio_np.reshape(-1, 2).mean(axis=1)
 
                     if framerate != 16000:
-                        step = framerate / 16000
-                        indices = np.arange(0, len(audio_np), step).astype(int)
-                        audio_np = audio_np[indices]
-
-                    audio_data = (audio_np * 32767).astype(np.int16).tobytes()
+                        # Linear interpolation instead of nearest-neighbor
+                        # indexing, which aliases and distorts the spectrum.
+                        n_out = int(len(audio_np) * 16000 / framerate)
+                        x_new = np.linspace(0, len(audio_np) - 1, n_out)
+                        audio_np = np.interp(
+                            x_new, np.arange(len(audio_np)), audio_np
+                        )
+
+                    audio_data = audio_np.astype(np.int16).tobytes()
                 except ImportError:
                     pass
 
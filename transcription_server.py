@@ -5,68 +5,613 @@ for transcribing audio data using Whisper.
 """
 
 import argparse
+import collections
 import io
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
 import wave
-from typing import Any
+from concurrent.futures import Future
+from typing import Any, Optional, Union
 
 import numpy as np
+import torch
 import whisper
-from flask import Flask, Response, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None  # type: ignore[assignment]
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None  # type: ignore[assignment]
+
+try:
+    from pywhispercpp.model import Model as WhisperCppModel
+except ImportError:
+    WhisperCppModel = None  # type: ignore[assignment]
+
+try:
+    import numba
+except ImportError:
+    numba = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 app = Flask(__name__)
 logger = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+
+# Upper bound on uploaded audio: 5 minutes of 16-bit mono PCM
+MAX_AUDIO_BYTES = 2 * SAMPLE_RATE * 60 * 5
+app.config["MAX_CONTENT_LENGTH"] = MAX_AUDIO_BYTES
+
+# Peak below ~0.1% of int16 full scale counts as silence
+SILENCE_PEAK = 32
+
 # Global model instance (loaded once at startup)
 model: Any = None
 model_name: str = ""
+use_fp16: bool = False
+backend: str = "whisper"
+force_english: bool = False
+
+# CTranslate2 compute types per precision for the faster-whisper backend
+_FW_COMPUTE_TYPES = {"fp32": "default", "fp16": "float16", "int8": "int8"}
+
 
+class _OnnxWhisperModel:
+    """Wrapper around an ONNX Runtime export of Whisper.
+
+    Expects the fused all-in-one graph produced offline by onnxruntime's
+    convert_to_onnx tool (see scripts/export_whisper_onnx.sh), which
+    embeds the encoder, the decoder loop, and beam search in one graph.
+    Mel extraction and token decoding reuse the whisper package.
+    """
+
+    def __init__(self, model_path: str) -> None:
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess_options.intra_op_num_threads = os.cpu_count() or 1
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options, providers=["CPUExecutionProvider"]
+        )
+        self.multilingual = ".en" not in os.path.basename(model_path)
+        self._tokenizers: dict = {}
+
+    def _tokenizer(self, language: Optional[str]) -> Any:
+        language = language or "en"
+        if language not in self._tokenizers:
+            self._tokenizers[language] = whisper.tokenizer.get_tokenizer(
+                multilingual=self.multilingual, language=language, task="transcribe"
+            )
+        return self._tokenizers[language]
+
+    def transcribe_text(self, audio_np: np.ndarray, language: Optional[str]) -> str:
+        """Transcribe a single 30s-window of audio through the ONNX graph."""
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio_np))
+        inputs = {
+            "input_features": mel.unsqueeze(0).numpy(),
+            "max_length": np.array([448], dtype=np.int32),
+            "min_length": np.array([0], dtype=np.int32),
+            "num_beams": np.array([1], dtype=np.int32),
+            "num_return_sequences": np.array([1], dtype=np.int32),
+            "length_penalty": np.array([1.0], dtype=np.float32),
+            "repetition_penalty": np.array([1.0], dtype=np.float32),
+        }
+        sequences = self.session.run(["sequences"], inputs)[0]
+        tokenizer = self._tokenizer(language)
+        tokens = [token for token in sequences[0][0] if token < tokenizer.eot]
+        return tokenizer.decode(tokens)
+
+
+def _warmup() -> None:
+    """Transcribe one second of silence and discard the result.
+
+    The first forward pass pays for lazy initialization (CUDA kernel
+    compilation, cuDNN autotune, Inductor/numba compiles); doing it at
+    startup keeps that cost out of the first real request.
+    """
+    transcribe_audio(np.zeros(SAMPLE_RATE, dtype=np.float32), "en")
+    logger.info("Model warmup complete")
+
+
+def load_model(
+    name: str = "small.en",
+    precision: str = "auto",
+    model_backend: str = "whisper",
+    compile_encoder: bool = False,
+) -> None:
+    """Load the Whisper model at the requested precision.
+
+    precision:
+    - auto: fp16 when CUDA is available, fp32 otherwise (default)
+    - fp32: stock weights
+    - fp16: half-precision weights on CUDA (~2x compute via tensor cores);
+      falls back to fp32 when no GPU is available
+    - int8: dynamic quantization of the Linear layers for CPU inference
+
+    model_backend:
+    - whisper: reference openai-whisper implementation (default)
+    - faster-whisper: CTranslate2 backend (requires the faster-whisper
+      package); substantially faster on CPU and releases the GIL during
+      the compute phase
+    - onnx: ONNX Runtime session over a fused int8 graph exported with
+      scripts/export_whisper_onnx.sh; name is the path to the .onnx file
+    - whisper.cpp: native GGML implementation via the pywhispercpp
+      package (SIMD mel extraction and GEMMs, no torch at runtime);
+      name is a ggml model name or path, precision is baked into the
+      model file and the precision argument is ignored
+
+    compile_encoder wraps the whisper backend's encoder in
+    torch.compile, paying the Inductor compile at startup; leave it off
+    for dev runs and with request batching, which feeds the encoder
+    varying batch sizes that would each recompile.
+    """
+    global model, model_name, use_fp16, backend
+    backend = model_backend
+
+    if precision == "auto":
+        precision = "fp16" if torch.cuda.is_available() else "fp32"
+
+    if model_backend == "onnx":
+        if onnxruntime is None:
+            raise RuntimeError(
+                "Backend 'onnx' requested but the onnxruntime package is not installed"
+            )
+        logger.info(f"Loading ONNX Whisper model: {name}")
+        model = _OnnxWhisperModel(name)
+        model_name = name
+        logger.info("ONNX Whisper model loaded successfully")
+        _warmup()
+        return
+
+    if model_backend == "whisper.cpp":
+        if WhisperCppModel is None:
+            raise RuntimeError(
+                "Backend 'whisper.cpp' requested but the pywhispercpp "
+                "package is not installed"
+            )
+        logger.info(f"Loading whisper.cpp model: {name}")
+        model = WhisperCppModel(name, n_threads=os.cpu_count() or 1)
+        model_name = name
+        logger.info("whisper.cpp model loaded successfully")
+        _warmup()
+        return
+
+    if model_backend == "faster-whisper":
+        if WhisperModel is None:
+            raise RuntimeError(
+                "Backend 'faster-whisper' requested but the faster-whisper "
+                "package is not installed"
+            )
+        logger.info(f"Loading faster-whisper model: {name} (precision: {precision})")
+        model = WhisperModel(name, device="auto", compute_type=_FW_COMPUTE_TYPES[precision])
+        model_name = name
+        logger.info("faster-whisper model loaded successfully")
+        _warmup()
+        return
+
+    logger.info(f"Loading Whisper model: {name} (precision: {precision})")
+    # Dynamically quantized Linear layers only have CPU kernels, so the
+    # int8 model must load on the CPU even when CUDA is available
+    model = whisper.load_model(name, device="cpu" if precision == "int8" else None)
+    use_fp16 = False
+
+    if precision == "fp16":
+        if torch.cuda.is_available():
+            model = model.half().cuda()
+            use_fp16 = True
+        else:
+            logger.warning("fp16 requested but CUDA is not available, keeping fp32")
+    elif precision == "int8":
+        # The transcription path is dominated by the matmul-heavy
+        # encoder/decoder Linear layers, so dynamic int8 GEMMs give most
+        # of the quantization win with negligible accuracy loss.
+        model = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    if compile_encoder and hasattr(torch, "compile"):
+        # The encoder dominates per-request cost, and the single-request
+        # path always feeds it a (1, n_mels, 3000) mel, so one
+        # reduce-overhead graph serves every request; run a dummy mel
+        # through it so the compile happens at startup, not on the
+        # first request.
+        try:
+            model.encoder = torch.compile(model.encoder, mode="reduce-overhead")
+            mel = whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(np.zeros(SAMPLE_RATE, dtype=np.float32))
+            ).unsqueeze(0).to(model.device)
+            if use_fp16:
+                mel = mel.half()
+            with torch.no_grad():
+                model.encoder(mel)
+            logger.info("Compiled and warmed up the encoder")
+        except Exception as exc:
+            logger.warning(f"Encoder compilation failed, keeping eager mode: {exc}")
 
-def load_model(name: str = "small.en") -> None:
-    """Load the Whisper model."""
-    global model, model_name
-    logger.info(f"Loading Whisper model: {name}")
-    model = whisper.load_model(name)
     model_name = name
     logger.info("Whisper model loaded successfully")
+    _warmup()
+
+
+# openai-whisper's DecodingTask installs kv-cache forward hooks on the
+# shared decoder modules, so concurrent decodes on one model corrupt
+# each other's caches; a whisper.cpp context is likewise single-
+# threaded. Those backends serialize inference here — faster-whisper
+# and ONNX Runtime sessions handle concurrent calls themselves.
+_inference_lock = threading.Lock()
+
+
+def transcribe_audio(audio_np: np.ndarray, language: Optional[str]) -> str:
+    """Run the configured backend on float32 audio and return the text."""
+    if backend == "onnx":
+        return model.transcribe_text(audio_np, language)
+
+    if backend == "faster-whisper":
+        segments, _info = model.transcribe(
+            audio_np, language=language, beam_size=1, vad_filter=False
+        )
+        return "".join(segment.text for segment in segments)
 
+    with _inference_lock:
+        if backend == "whisper.cpp":
+            segments = model.transcribe(audio_np, language=language or "auto")
+            return " ".join(segment.text for segment in segments)
 
-def audio_bytes_to_numpy(audio_data: bytes) -> np.ndarray:
-    """Convert raw PCM audio bytes (16-bit, 16kHz, mono) to numpy array."""
-    audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        result = model.transcribe(audio_np, fp16=use_fp16, language=language)
+        return result.get("text", "")
+
+
+def transcribe_segments(audio_np: np.ndarray, language: Optional[str]):
+    """Yield transcription segment texts for the streaming response.
+
+    faster-whisper yields segments incrementally as decoding advances;
+    the other backends transcribe the whole clip first and then yield
+    their segments, so only the framing is incremental there.
+    """
+    if backend == "onnx":
+        yield model.transcribe_text(audio_np, language)
+        return
+
+    if backend == "whisper.cpp":
+        with _inference_lock:
+            segments = model.transcribe(audio_np, language=language or "auto")
+        for segment in segments:
+            yield segment.text
+        return
+
+    if backend == "faster-whisper":
+        segments, _info = model.transcribe(
+            audio_np, language=language, beam_size=1, vad_filter=False
+        )
+        for segment in segments:
+            yield segment.text
+        return
+
+    with _inference_lock:
+        result = model.transcribe(audio_np, fp16=use_fp16, language=language)
+    for segment in result.get("segments", []):
+        yield segment["text"]
+
+
+class _BatchWorker:
+    """Coalesce concurrent /transcribe calls into one Whisper forward pass.
+
+    The encoder pads every clip to a 30s window, so a batch of queued
+    short clips costs roughly the same encoder pass as a single one.
+    Requests enqueue their audio and block on a Future; this worker
+    drains whatever arrives within the batching window, stacks the mel
+    spectrograms and decodes the whole batch with one whisper.decode
+    call per language.
+    """
+
+    # Longer clips need the sequential 30s-windowing of model.transcribe
+    _MAX_BATCH_SAMPLES = 30 * SAMPLE_RATE
+
+    def __init__(self, window_ms: int, max_batch: int = 8) -> None:
+        self._window = window_ms / 1000.0
+        self._max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, audio_np: np.ndarray, language: Optional[str]) -> str:
+        """Queue audio for the next batch and wait for its transcription."""
+        # Extract the mel spectrogram here on the request thread: with
+        # several gthread workers the CPU mel work for incoming requests
+        # overlaps the batch the model is already busy with.
+        mel = None
+        if len(audio_np) <= self._MAX_BATCH_SAMPLES:
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio_np))
+        future: Future = Future()
+        self._queue.put((mel, audio_np, language, future))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch: list) -> None:
+        if len(batch) == 1 or any(mel is None for mel, _, _, _ in batch):
+            for _, audio_np, language, future in batch:
+                try:
+                    future.set_result(transcribe_audio(audio_np, language))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+
+        groups: dict = collections.defaultdict(list)
+        for item in batch:
+            groups[item[2]].append(item)
+        for language, items in groups.items():
+            self._decode_group(language, items)
+
+    def _decode_group(self, language: Optional[str], items: list) -> None:
+        try:
+            mel = torch.stack([mel for mel, _, _, _ in items])
+            if use_fp16:
+                # Stage through pinned memory so the host-to-device copy
+                # runs async rather than stalling on a pageable-memory
+                # sync
+                mel = mel.pin_memory().to(model.device, non_blocking=True).half()
+            else:
+                # whisper.decode expects its input on the model's device
+                # (fp32 CUDA models included)
+                mel = mel.to(model.device)
+            options = whisper.DecodingOptions(
+                language=language, fp16=use_fp16, without_timestamps=True
+            )
+            # The streaming path decodes on request threads concurrently
+            # with this worker, so batched decodes take the lock too
+            with _inference_lock:
+                results = whisper.decode(model, mel, options)
+            for (_, _, _, future), result in zip(items, results):
+                future.set_result(result.text)
+        except Exception as exc:
+            for _, _, _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+
+
+_batch_worker: Optional[_BatchWorker] = None
+
+
+def start_batching(window_ms: int) -> None:
+    """Enable dynamic request batching for the stock whisper backend."""
+    global _batch_worker
+    if window_ms <= 0:
+        return
+    if backend != "whisper":
+        logger.warning("Request batching only supports the whisper backend, ignoring")
+        return
+    logger.info(f"Batching concurrent requests within a {window_ms}ms window")
+    _batch_worker = _BatchWorker(window_ms)
+
+
+# Float32 conversion buffers reused across requests, bucketed by sample
+# count. Push-to-talk clients send a narrow range of clip lengths, so a
+# few buffers per size absorb almost all conversion allocations. Retained
+# memory is bounded: at most a few buffers per size, a global byte cap,
+# and FIFO eviction so a client cycling body sizes cannot grow RSS
+# without bound.
+_POOL_MAX_PER_SIZE = 4
+_POOL_MAX_BYTES = 64 * 1024 * 1024
+_buffer_pool: dict = collections.defaultdict(collections.deque)
+_pool_order: collections.deque = collections.deque()  # sizes, oldest first
+_pool_bytes: int = 0
+_buffer_pool_lock = threading.Lock()
+
+
+def _acquire_buffer(n_samples: int) -> np.ndarray:
+    """Take a pooled float32 buffer of the given size, or allocate one."""
+    global _pool_bytes
+    with _buffer_pool_lock:
+        bucket = _buffer_pool.get(n_samples)
+        if bucket:
+            # Buffers of one size are interchangeable, so removing any
+            # matching entry keeps the FIFO consistent with the bucket
+            _pool_order.remove(n_samples)
+            _pool_bytes -= n_samples * 4
+            return bucket.pop()
+    return np.empty(n_samples, dtype=np.float32)
+
+
+def release_audio_buffer(audio_np: np.ndarray) -> None:
+    """Return a conversion buffer for reuse by later requests.
+
+    Callers that skip the release simply forgo reuse; the buffer is then
+    garbage collected as before.
+    """
+    global _pool_bytes
+    if audio_np.nbytes > _POOL_MAX_BYTES:
+        return
+    with _buffer_pool_lock:
+        bucket = _buffer_pool[audio_np.size]
+        if len(bucket) >= _POOL_MAX_PER_SIZE:
+            return
+        bucket.append(audio_np)
+        _pool_order.append(audio_np.size)
+        _pool_bytes += audio_np.nbytes
+        while _pool_bytes > _POOL_MAX_BYTES:
+            evicted_size = _pool_order.popleft()
+            _buffer_pool[evicted_size].popleft()
+            _pool_bytes -= evicted_size * 4
+            if not _buffer_pool[evicted_size]:
+                del _buffer_pool[evicted_size]
+
+
+# Clips long enough for the parallel numba kernel to beat the single-
+# threaded numpy multiply (one minute of 16kHz mono)
+_NUMBA_MIN_SAMPLES = 60 * SAMPLE_RATE
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _convert_and_pad(int16_view: np.ndarray, out_f32: np.ndarray) -> None:
+        """Fused convert+scale+zero-pad loop, parallelized across cores."""
+        scale = np.float32(1.0 / 32768.0)
+        n_samples = int16_view.size
+        for i in numba.prange(out_f32.size):
+            if i < n_samples:
+                out_f32[i] = int16_view[i] * scale
+            else:
+                out_f32[i] = 0.0
+
+
+def audio_bytes_to_numpy(audio_data: Union[bytes, memoryview], target_samples: int = 0) -> np.ndarray:
+    """Convert raw PCM audio bytes (16-bit, 16kHz, mono) to numpy array.
+
+    The conversion is a single fused multiply into a pooled float32
+    buffer: one SIMD pass over the input instead of astype + divide,
+    which would materialize an intermediate copy and traverse twice.
+
+    target_samples extends the result with trailing silence up to that
+    many samples; converting straight into the padded buffer avoids the
+    second full copy that an np.pad after conversion would make.
+    """
+    int16_view = np.frombuffer(audio_data, dtype=np.int16)
+    n_samples = len(int16_view)
+    audio_np = _acquire_buffer(max(n_samples, target_samples))
+    if numba is not None and n_samples >= _NUMBA_MIN_SAMPLES:
+        # Long clips are memory-bound: the parallel kernel spreads the
+        # conversion across cores (compiled once, cached on disk)
+        _convert_and_pad(int16_view, audio_np)
+    else:
+        np.multiply(int16_view, np.float32(1.0 / 32768.0), out=audio_np[:n_samples])
+        audio_np[n_samples:] = 0.0
     return audio_np
 
 
+def ojson(payload: dict, status: int = 200) -> Response:
+    """jsonify replacement that serializes with orjson when installed.
+
+    orjson.dumps emits bytes several times faster than the stdlib
+    encoder behind jsonify — worth having for /health, which liveness
+    probes may hit many times per second. Falls back to jsonify when
+    orjson is not available.
+    """
+    if orjson is not None:
+        return Response(orjson.dumps(payload), status=status, mimetype="application/json")
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+
+def _json_line(payload: dict) -> bytes:
+    """Serialize one NDJSON line for the streaming response."""
+    if orjson is not None:
+        return orjson.dumps(payload) + b"\n"
+    return (json.dumps(payload) + "\n").encode()
+
+
+def _setup_logging(debug: bool = False) -> None:
+    """Route log records through a queue to a background writer thread.
+
+    Handler I/O goes to stdout, which Docker's log driver captures; a
+    synchronous handler would stall request threads on that write.
+    QueueHandler makes the hot-path cost a single queue put.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def _read_audio_body() -> Optional[bytes]:
+    """Read the PCM request body in bounded 64 KiB chunks.
+
+    Reading request.stream directly skips Flask's body cache and its
+    extra copy, and enforces the upload cap without allocating the full
+    9.6 MB bound up front for a typical ~100 KB clip. Handles chunked
+    uploads too (the streaming client sends no Content-Length). Returns
+    None when the body exceeds MAX_AUDIO_BYTES.
+    """
+    chunks = []
+    total = 0
+    while total < MAX_AUDIO_BYTES:
+        chunk = request.stream.read(min(65536, MAX_AUDIO_BYTES - total))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        total += len(chunk)
+    else:
+        # Cap reached: anything left in the stream means the body is too big
+        if request.stream.read(1):
+            return None
+    return b"".join(chunks)
+
+
 @app.route("/health", methods=["GET"])
 def health() -> Response:
     """Health check endpoint."""
-    return jsonify({"status": "healthy", "model_loaded": model is not None})
+    return ojson({"status": "healthy", "model_loaded": model is not None})
 
 
 @app.route("/info", methods=["GET"])
 def info() -> Response:
     """Server info endpoint."""
-    return jsonify({"model": model_name, "model_loaded": model is not None})
+    return ojson({"model": model_name, "model_loaded": model is not None})
 
 
 @app.route("/transcribe", methods=["POST"])
-def transcribe() -> tuple[Response, int]:
+def transcribe() -> Response:
     """Transcribe audio data to text.
 
-    Expects raw PCM audio data (16-bit, 16kHz, mono) in request body.
+    Expects raw PCM audio data (16-bit, 16kHz, mono) in the request body,
+    declared as either application/octet-stream or audio/l16;rate=16000.
 
     Optional query parameters:
     - language: Language code for transcription (default: en)
     - pad_seconds: Pad audio to this duration in seconds (default: 0)
+    - stream: Set to 1 to stream segments as NDJSON lines
+      ({"segment": i, "text": ...}) instead of one buffered JSON body
 
     Returns JSON with 'text' field containing transcribed text.
     """
     if model is None:
-        return jsonify({"error": "Model not loaded"}), 500
+        return ojson({"error": "Model not loaded"}, 500)
+
+    if request.mimetype == "audio/l16":
+        rate = request.mimetype_params.get("rate", str(SAMPLE_RATE))
+        if rate != str(SAMPLE_RATE):
+            return ojson({"error": f"Unsupported sample rate {rate}, expected {SAMPLE_RATE}"}, 400)
 
-    audio_data = request.data
+    audio_data = _read_audio_body()
+    if audio_data is None:
+        return ojson({"error": f"Audio data exceeds {MAX_AUDIO_BYTES} bytes"}, 413)
     if not audio_data:
-        return jsonify({"error": "No audio data provided"}), 400
+        return ojson({"error": "No audio data provided"}, 400)
 
     language = request.args.get("language", "auto")
     pad_seconds = float(request.args.get("pad_seconds", "0"))
@@ -75,34 +620,130 @@ def transcribe() -> tuple[Response, int]:
     if language == "auto":
         language = None
 
-    logger.info(f"Received {len(audio_data)} bytes of audio data (language: {language or 'auto'})")
+    # Language detection costs an extra encoder pass over the first 30s;
+    # skip it when the answer is fixed anyway (monolingual .en model or
+    # --force-english deployment)
+    if force_english:
+        language = "en"
+    elif language is None and model_name.endswith(".en"):
+        language = "en"
 
-    try:
-        audio_np = audio_bytes_to_numpy(audio_data)
-
-        # Apply padding if requested
-        if pad_seconds > 0:
-            sample_rate = 16000
-            target_samples = int(pad_seconds * sample_rate)
-            if len(audio_np) < target_samples:
-                padding_samples = target_samples - len(audio_np)
-                current_duration = len(audio_np) / sample_rate
-                logger.info(f"Padding audio from {current_duration:.2f}s to {pad_seconds}s")
-                audio_np = np.pad(audio_np, (0, padding_samples), mode='constant', constant_values=0.0)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Received {len(audio_data)} bytes of audio data (language: {language or 'auto'})")
 
-        result = model.transcribe(audio_np, fp16=False, language=language)
-        text = result.get("text", "").strip()
+    # Apply padding (if requested) during conversion rather than with a
+    # separate np.pad copy afterwards
+    target_samples = int(pad_seconds * SAMPLE_RATE) if pad_seconds > 0 else 0
+    n_samples = len(audio_data) // 2
+    if n_samples < target_samples:
+        logger.info(f"Padding audio from {n_samples / SAMPLE_RATE:.2f}s to {pad_seconds}s")
 
-        logger.info(f"Transcription completed: '{text}'")
-        return jsonify({"text": text}), 200
+    try:
+        # Silence gate: two int16 reductions are ~free next to the
+        # encoder+decoder pass they skip, and voice-gated clients send
+        # plenty of pure-padding clips
+        int16_view = np.frombuffer(audio_data, dtype=np.int16)
+        peak = max(int(int16_view.max()), -int(int16_view.min()))
+        if peak < SILENCE_PEAK:
+            logger.info("Clip is silent, skipping transcription")
+            if request.args.get("stream") == "1":
+                # Streaming clients expect NDJSON framing: zero segments
+                return Response(b"", mimetype="application/x-ndjson")
+            return ojson({"text": ""})
+
+        audio_np = audio_bytes_to_numpy(audio_data, target_samples)
+        # Drop the raw PCM buffer (and the gate's view pinning it) now
+        # that the float32 copy exists, so it does not sit in memory for
+        # the whole inference
+        del audio_data, int16_view
+
+        if request.args.get("stream") == "1":
+            # The generator owns the pooled buffer: it keeps running
+            # after this handler returns, so the release happens once
+            # the stream is exhausted
+            def generate():
+                try:
+                    segments = transcribe_segments(audio_np, language)
+                    for i, segment_text in enumerate(segments):
+                        yield _json_line({"segment": i, "text": segment_text.strip()})
+                finally:
+                    release_audio_buffer(audio_np)
+
+            return Response(
+                stream_with_context(generate()), mimetype="application/x-ndjson"
+            )
+
+        try:
+            if _batch_worker is not None:
+                text = _batch_worker.submit(audio_np, language).strip()
+            else:
+                text = transcribe_audio(audio_np, language).strip()
+        finally:
+            release_audio_buffer(audio_np)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Transcription completed: '{text}'")
+        return ojson({"text": text})
 
     except Exception as e:
         logger.exception(f"Transcription error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return ojson({"error": str(e)}, 500)
+
+
+def _should_compile_encoder(requested: bool, batch_window_ms: int) -> bool:
+    """Resolve the encoder-compilation setting against request batching.
+
+    The batch worker feeds the encoder stacked mels of varying batch
+    size, and each new size would trigger a recompile inside a live
+    request, so compilation is refused when batching is enabled.
+    """
+    if requested and batch_window_ms > 0:
+        logger.warning(
+            "Encoder compilation disabled: request batching feeds varying "
+            "batch sizes that would each recompile"
+        )
+        return False
+    return requested
+
+
+def create_app() -> Flask:
+    """Build the app for a production WSGI server.
+
+    Model selection comes from the environment (STT_MODEL, STT_PRECISION,
+    STT_BACKEND) because gunicorn owns the command line:
+
+        gunicorn --bind 0.0.0.0:5000 --workers 1 --threads 4 \\
+            --worker-class gthread 'transcription_server:create_app()'
+
+    A single worker keeps one model copy in memory. Threads overlap
+    upload reads, conversion and response writes; inference itself is
+    serialized for the stock whisper and whisper.cpp backends (their
+    decoders are not thread-safe), while faster-whisper and onnx decode
+    concurrently.
+    """
+    _setup_logging()
+    if model is None:
+        global force_english
+        force_english = os.environ.get("STT_FORCE_ENGLISH", "") == "1"
+        batch_window_ms = int(os.environ.get("STT_BATCH_WINDOW_MS", "0"))
+        load_model(
+            os.environ.get("STT_MODEL", "small.en"),
+            precision=os.environ.get("STT_PRECISION", "auto"),
+            model_backend=os.environ.get("STT_BACKEND", "whisper"),
+            compile_encoder=_should_compile_encoder(
+                os.environ.get("STT_COMPILE_ENCODER", "") == "1", batch_window_ms
+            ),
+        )
+        start_batching(batch_window_ms)
+    return app
 
 
 def main() -> None:
-    """Application entry point."""
+    """Development entry point (Werkzeug dev server).
+
+    Production deployments run under gunicorn via create_app(); see
+    scripts/start_server.sh.
+    """
     parser = argparse.ArgumentParser(description="Transcription API server")
     parser.add_argument(
         "--host",
@@ -122,6 +763,41 @@ def main() -> None:
         default="small.en",
         help="Whisper model to use (default: small.en)"
     )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        choices=["auto", "fp32", "fp16", "int8"],
+        default="auto",
+        help="Model precision: fp16 needs CUDA, int8 quantizes for CPU "
+             "(default: auto, fp16 when CUDA is available else fp32)"
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["whisper", "faster-whisper", "onnx", "whisper.cpp"],
+        default="whisper",
+        help="Inference backend; faster-whisper and onnx require their optional packages (default: whisper)"
+    )
+    parser.add_argument(
+        "--compile-encoder",
+        action="store_true",
+        help="Compile the Whisper encoder with torch.compile, paying the "
+             "Inductor compile at startup (whisper backend only; ignored "
+             "with --batch-window-ms)"
+    )
+    parser.add_argument(
+        "--force-english",
+        action="store_true",
+        help="Always transcribe as English, skipping language detection "
+             "even when the request asks for auto"
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=int,
+        default=0,
+        help="Batch concurrent requests arriving within this window into one "
+             "forward pass, whisper backend only (default: 0, disabled)"
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -131,14 +807,18 @@ def main() -> None:
     args = parser.parse_args()
 
     # Configure logging
-    log_level = logging.DEBUG if args.debug else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    _setup_logging(debug=args.debug)
 
     # Load model before starting server
-    load_model(args.model)
+    global force_english
+    force_english = args.force_english
+    load_model(
+        args.model,
+        precision=args.precision,
+        model_backend=args.backend,
+        compile_encoder=_should_compile_encoder(args.compile_encoder, args.batch_window_ms),
+    )
+    start_batching(args.batch_window_ms)
 
     # Run Flask server
     logger.info(f"Starting transcription server on {args.host}:{args.port}")